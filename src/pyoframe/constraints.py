@@ -777,7 +777,10 @@ class Constraint(Expression):
             self._model = lhs._model
         self.sense = sense
 
-    def to_str(self, max_line_len=None, max_rows=None, var_map=None, float_precision=None):
+    def to_lp_lines(self, max_line_len=None, max_rows=None, var_map=None, float_precision=None):
+        """
+        Returns a DataFrame with a single column `expr` holding one constraint per row (e.g. `name[dim]: 2 x1 + 3 x2 <= 4`).
+        """
         dims = self.dimensions
         str_table = self.to_str_table(
             max_line_len=max_line_len,
@@ -793,12 +796,21 @@ class Constraint(Expression):
         constr_str = pl.concat(
             [str_table, rhs], how=("align" if dims else "horizontal")
         )
-        constr_str = constr_str.select(
-            pl.concat_str("expr", pl.lit(f" {self.sense.value} "), "rhs").str.concat(
-                delimiter="\n"
+        return constr_str.select(
+            pl.concat_str("expr", pl.lit(f" {self.sense.value} "), "rhs").alias("expr")
+        )
+
+    def to_str(self, max_line_len=None, max_rows=None, var_map=None, float_precision=None):
+        return (
+            self.to_lp_lines(
+                max_line_len=max_line_len,
+                max_rows=max_rows,
+                var_map=var_map,
+                float_precision=float_precision,
             )
-        ).item()
-        return constr_str
+            .select(pl.col("expr").str.concat(delimiter="\n"))
+            .item()
+        )
 
     def __repr__(self) -> str:
         return (
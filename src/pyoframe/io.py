@@ -8,93 +8,136 @@ MIT License
 Module containing all import/export functionalities.
 """
 
-from io import TextIOWrapper
-from tempfile import NamedTemporaryFile
+import os
+from io import BufferedWriter
+from tempfile import NamedTemporaryFile, mkstemp
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
 
-from pyoframe.constants import VAR_KEY
-from pyoframe.var_mapping import DEFAULT_MAP, VariableMapping
+from pyoframe.constants import VAR_KEY, ObjSense, VType
+from pyoframe.var_mapping import VariableMapping, get_var_map
 
 if TYPE_CHECKING: # pragma: no cover
     from pyoframe.model import Model
+    from pyoframe.variables import Variable
 
 import polars as pl
 
+# Much larger than the 8 KiB default to keep the number of write syscalls low on large models.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
 
-def objective_to_file(m: "Model", f: TextIOWrapper, var_map):
+LINE_KEY = "__line"
+
+# Constant parts of the file, encoded once rather than on every write
+OBJECTIVE_HEADERS = {sense: f"{sense.value}\n\nobj:\n\n".encode() for sense in ObjSense}
+END = b"end\n"
+
+
+def objective_to_file(m: "Model", f: BufferedWriter, var_map):
     """
     Write out the objective of a model to a lp file.
     """
     assert m.objective is not None, "No objective set."
 
-    f.write(f"{m.objective.sense.value}\n\nobj:\n\n")
     result = m.objective.to_str(var_map=var_map, include_name=False)
-    f.writelines(result)
+    f.write(OBJECTIVE_HEADERS[m.objective.sense])
+    f.write(result.encode())
+
+
+def constraints_to_file(m: "Model", f: BufferedWriter, var_map):
+    write_section(
+        f,
+        "s.t.",
+        (
+            constraint.to_lp_lines(var_map=var_map).lazy()
+            for constraint in m.constraints
+        ),
+    )
+
+
+def bounds_to_file(
+    m: "Model",
+    f: BufferedWriter,
+    var_map: VariableMapping,
+    mapped_integer_vars: Dict[str, pl.DataFrame],
+):
+    """
+    Write out variables of a model to a lp file.
 
+    Binary and integer variables are taken from `mapped_integer_vars` (already mapped, by name) rather than mapped again.
+    """
+    write_section(
+        f,
+        "bounds",
+        (_bounds_lines(v, var_map, mapped_integer_vars) for v in m.variables),
+    )
 
-def constraints_to_file(m: "Model", f: TextIOWrapper, var_map):
-    for constraint in create_section(m.constraints, f, "s.t."):
-        f.writelines(constraint.to_str(var_map=var_map) + "\n")
 
+def _bounds_lines(
+    variable: "Variable",
+    var_map: VariableMapping,
+    mapped_integer_vars: Dict[str, pl.DataFrame],
+) -> pl.LazyFrame:
+    lb = f"{variable.lb:.12g}"
+    ub = f"{variable.ub:.12g}"
 
-def bounds_to_file(m: "Model", f, var_map):
-    """
-    Write out variables of a model to a lp file.
-    """
-    for variable in create_section(m.variables, f, "bounds"):
-        lb = f"{variable.lb:.12g}"
-        ub = f"{variable.ub:.12g}"
-
-        df = (
-            var_map.map_vars(variable.data)
-            .select(
-                pl.concat_str(
-                    pl.lit(f"{lb} <= "), VAR_KEY, pl.lit(f" <= {ub}\n")
-                ).str.concat("")
-            )
-            .item()
-        )
+    mapped = mapped_integer_vars.get(variable.name)
+    if mapped is None:
+        mapped = var_map.map_vars(variable.data)
 
-        f.writelines(df)
+    return mapped.lazy().select(
+        pl.concat_str(pl.lit(f"{lb} <= "), VAR_KEY, pl.lit(f" <= {ub}"))
+    )
 
 
-def binaries_to_file(m: "Model", f, var_map: VariableMapping):
+def binaries_and_integers_to_file(
+    m: "Model", f: BufferedWriter, mapped_integer_vars: Dict[str, pl.DataFrame]
+):
     """
-    Write out binaries of a model to a lp file.
+    Write out binaries and integers of a model to a lp file.
+
+    Both sections are collected in a single pass over the model's variables.
+    `mapped_integer_vars` holds every binary and integer variable already mapped, by name (see `to_file`).
     """
-    for variable in create_section(m.binary_variables, f, "binary"):
-        lines = (
-            var_map.map_vars(variable.data)
-            .select(pl.col(VAR_KEY).str.concat("\n"))
-            .item()
-        )
-        f.writelines(lines + "\n")
+    sections: Dict[VType, List[pl.LazyFrame]] = {VType.BINARY: [], VType.INTEGER: []}
+    for variable in m.variables:
+        if variable.vtype in sections:
+            sections[variable.vtype].append(
+                mapped_integer_vars[variable.name].lazy().select(VAR_KEY)
+            )
+    write_section(f, "binary", sections[VType.BINARY])
+    write_section(f, "general", sections[VType.INTEGER])
 
 
-def integers_to_file(m: "Model", f, var_map: VariableMapping):
+def write_section(
+    f: BufferedWriter, section_header: str, lines: Iterable[pl.LazyFrame]
+):
     """
-    Write out integers of a model to a lp file.
-    """
-    for variable in create_section(m.integer_variables, f, "general"):
-        lines = (
-            var_map.map_vars(variable.data)
-            .select(pl.col(VAR_KEY).str.concat("\n"))
-            .item()
-        )
-        f.writelines(lines + "\n")
+    Writes a section of the lp file (e.g. `bounds`) from frames of LP lines.
 
+    Every frame is written on its own such that only one element's lines are held in memory at a time.
+    The header is prepended as the first row of the first frame. Nothing is written if there are no lines.
+    """
+    # The second trailing newline comes from the line terminator added to every row
+    header = pl.LazyFrame({LINE_KEY: [f"\n\n{section_header}\n"]})
+    for df in lines:
+        df = df.rename({df.columns[0]: LINE_KEY})
+        if header is not None:
+            df = pl.concat([header, df], how="vertical", rechunk=False)
+            header = None
+        _format_and_write(df, f)
 
-T = TypeVar("T")
 
+def _format_and_write(df: pl.LazyFrame, f: BufferedWriter):
+    """
+    Writes a single-column frame of LP lines to `f`, one line per row.
 
-def create_section(iterable: Iterable[T], f, section_header) -> Iterable[T]:
-    wrote = False
-    for item in iterable:
-        if not wrote:
-            f.write(f"\n\n{section_header}\n\n")
-            wrote = True
-        yield item
+    Polars writes straight into `f` which avoids building one large Python string.
+    `LazyFrame.sink_csv` would be preferable but it only accepts a path (not an open file) in the Polars version we support.
+    """
+    df.collect(streaming=True).write_csv(
+        f, include_header=False, quote_style="never"
+    )
 
 
 def to_file(
@@ -112,17 +155,28 @@ def to_file(
     fn = Path(fn)
     assert fn.suffix == ".lp", f"File format `{fn.suffix}` not supported."
 
-    if fn.exists():
-        fn.unlink()
-
-    var_map = m.var_map if use_var_names else DEFAULT_MAP
-
-    with open(fn, mode="w") as f:
-        objective_to_file(m, f, var_map)
-        constraints_to_file(m, f, var_map)
-        bounds_to_file(m, f, var_map)
-        binaries_to_file(m, f, var_map)
-        integers_to_file(m, f, var_map)
-        f.write("end\n")
+    var_map = get_var_map(m, use_var_names)
+    # Binary and integer variables appear in two sections, they're only mapped once
+    mapped_integer_vars = {
+        v.name: var_map.map_vars(v.data)
+        for v in m.variables
+        if v.vtype != VType.CONTINUOUS
+    }
+
+    # Write to a sibling file first and then swap it in such that `fn` is never left half-written.
+    # Every call gets its own sibling file such that concurrent writes to the same `fn` don't clash.
+    fd, tmp_fn = mkstemp(dir=fn.parent, prefix=fn.name, suffix=".tmp")
+    tmp_fn = Path(tmp_fn)
+    try:
+        with open(fd, mode="wb", buffering=WRITE_BUFFER_SIZE) as f:
+            objective_to_file(m, f, var_map)
+            constraints_to_file(m, f, var_map)
+            bounds_to_file(m, f, var_map, mapped_integer_vars)
+            binaries_and_integers_to_file(m, f, mapped_integer_vars)
+            f.write(END)
+        os.replace(tmp_fn, fn)
+    except BaseException:
+        tmp_fn.unlink(missing_ok=True)
+        raise
 
     return fn
@@ -1,5 +1,25 @@
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import polars as pl
+
+from pyoframe.constants import (
+    COEF_KEY,
+    RESERVED_COL_KEYS,
+    VAR_KEY,
+    ConstraintSense,
+    ObjSense,
+    VType,
+)
+from pyoframe.util import concat_dimensions
+from pyoframe.var_mapping import get_var_map
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pyoframe.model import Model
+
+COL_KEY = "__col"
+ROW_KEY = "__row"
 
 
 def solve(m, solver, output_dir: Optional[Path] = None, **kwargs):
@@ -12,7 +32,16 @@ def solve(m, solver, output_dir: Optional[Path] = None, **kwargs):
         raise ValueError(f"Solver {solver} not recognized or supported.")
 
 
-def gurobi_solve(model, dir_path: Optional[Path] = None, use_var_names=True):
+def gurobi_solve(
+    model, dir_path: Optional[Path] = None, use_var_names=True, direct=False
+):
+    """
+    Solves the model with Gurobi and returns the solved gurobipy model.
+
+    By default, the model is written to an .lp file in `dir_path` (the current directory if not given) that Gurobi then reads.
+    With `direct=True`, the Gurobi model is instead built from the model's DataFrames (see `create_gurobi_model`),
+    which skips writing and parsing the .lp file. Either way, the solution is written to a .sol file in `dir_path`.
+    """
     import gurobipy as gp
 
     if dir_path is None:
@@ -21,12 +50,130 @@ def gurobi_solve(model, dir_path: Optional[Path] = None, use_var_names=True):
     if not dir_path.exists():
         dir_path.mkdir(parents=True)
 
-    problem_file = dir_path / f"{model.name}.lp"
-    model.to_file(problem_file, use_var_names=use_var_names)
-    gurobi_model = gp.read(str(problem_file))
+    if direct:
+        gurobi_model = create_gurobi_model(model, use_var_names=use_var_names)
+    else:
+        problem_file = dir_path / f"{model.name}.lp"
+        model.to_file(problem_file, use_var_names=use_var_names)
+        gurobi_model = gp.read(str(problem_file))
     gurobi_model.optimize()
     if gurobi_model.status != gp.GRB.OPTIMAL:
         raise Exception(f"Optimization failed with status {gurobi_model.status}")
 
     gurobi_model.write(str(dir_path / f"{model.name}.sol"))
     return gurobi_model
+
+
+def create_gurobi_model(model: "Model", use_var_names=True):
+    """
+    Builds a gurobipy model equivalent to the LP file of `model` without writing or parsing the file.
+
+    All variables are added in a single `addMVar` call and all constraints in a single `addMConstr` call.
+    Unlike `gurobi_solve`, the returned model isn't optimized yet. Requires scipy.
+    """
+    import gurobipy as gp
+
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError as e:
+        raise ImportError(
+            "Building Gurobi models directly requires scipy, solve without `direct=True` instead."
+        ) from e
+
+    assert model.objective is not None, "No objective set."
+
+    var_map = get_var_map(model, use_var_names)
+    vtypes = {
+        VType.CONTINUOUS: gp.GRB.CONTINUOUS,
+        VType.BINARY: gp.GRB.BINARY,
+        VType.INTEGER: gp.GRB.INTEGER,
+    }
+    senses = {
+        ConstraintSense.LE: gp.GRB.LESS_EQUAL,
+        ConstraintSense.GE: gp.GRB.GREATER_EQUAL,
+        ConstraintSense.EQ: gp.GRB.EQUAL,
+    }
+
+    gurobi_model = gp.Model(model.name)
+
+    # Variables, the column of each variable in the constraint matrix is its position in var_cols
+    variables = model.variables
+    var_cols = pl.concat([v.data.select(VAR_KEY) for v in variables]).with_row_index(
+        COL_KEY
+    )
+    sizes = [v.data.height for v in variables]
+    x = gurobi_model.addMVar(
+        var_cols.height,
+        lb=np.repeat([float(v.lb) for v in variables], sizes),
+        ub=np.repeat([float(v.ub) for v in variables], sizes),
+        vtype=np.repeat([vtypes[v.vtype] for v in variables], sizes),
+        name=pl.concat([var_map.map_vars(v.data).select(VAR_KEY) for v in variables])
+        .get_column(VAR_KEY)
+        .to_list(),
+    )
+
+    # Objective
+    objective = model.objective
+    obj_terms = objective.variable_terms.join(var_cols, on=VAR_KEY)
+    obj = np.zeros(var_cols.height)
+    np.add.at(
+        obj,
+        obj_terms.get_column(COL_KEY).to_numpy(),
+        obj_terms.get_column(COEF_KEY).to_numpy(),
+    )
+    x.Obj = obj
+    gurobi_model.ObjCon = objective.constant_terms.get_column(COEF_KEY).sum()
+    gurobi_model.ModelSense = (
+        gp.GRB.MAXIMIZE if objective.sense == ObjSense.MAX else gp.GRB.MINIMIZE
+    )
+
+    # Constraints, one row per unique combination of a constraint's dimensions
+    terms, rhs = [], []
+    n_rows = 0
+    for constraint in model.constraints:
+        dims = constraint.dimensions_unsafe
+        constr_rhs = constraint.constant_terms.with_row_index(ROW_KEY, offset=n_rows)
+        constr_terms = constraint.variable_terms.join(var_cols, on=VAR_KEY)
+        if dims:
+            constr_terms = constr_terms.join(constr_rhs.select(*dims, ROW_KEY), on=dims)
+        else:
+            constr_terms = constr_terms.with_columns(
+                pl.lit(n_rows, dtype=pl.UInt32).alias(ROW_KEY)
+            )
+        terms.append(constr_terms.select(ROW_KEY, COL_KEY, COEF_KEY))
+        rhs.append(
+            concat_dimensions(
+                constr_rhs,
+                prefix=constraint.name,
+                keep_dims=False,
+                ignore_columns=[*RESERVED_COL_KEYS, ROW_KEY],
+            ).select(
+                -pl.col(COEF_KEY),
+                pl.lit(senses[constraint.sense]).alias("sense"),
+                "concated_dim",
+            )
+        )
+        n_rows += constr_rhs.height
+
+    if n_rows:
+        terms = pl.concat(terms)
+        rhs = pl.concat(rhs)
+        A = csr_matrix(
+            (
+                terms.get_column(COEF_KEY).to_numpy(),
+                (
+                    terms.get_column(ROW_KEY).to_numpy(),
+                    terms.get_column(COL_KEY).to_numpy(),
+                ),
+            ),
+            shape=(n_rows, var_cols.height),
+        )
+        gurobi_model.addMConstr(
+            A,
+            x,
+            rhs.get_column("sense").to_numpy(),
+            rhs.get_column(COEF_KEY).to_numpy(),
+            name=rhs.get_column("concated_dim").to_list(),
+        )
+
+    return gurobi_model
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 import polars as pl
 from pyoframe.constants import CONST_TERM
 from pyoframe.constants import VAR_KEY
@@ -17,27 +17,42 @@ class NamedVariables(VariableMapping):
     VAR_NAME_KEY = "_var_name"
 
     def __init__(self, m: "Model") -> None:
-        self.map = pl.DataFrame(
+        self._map = pl.DataFrame(
             {
                 VAR_KEY: [CONST_TERM],
                 self.VAR_NAME_KEY: [""],
             },  # Constant value is variable 0
             schema={VAR_KEY: pl.UInt32, self.VAR_NAME_KEY: pl.String},
         )
+        # Names of added variables not yet concatenated into _map (see the map property)
+        self._pending: List[pl.DataFrame] = []
 
-        for var in m.variables:
-            self.add_var(var)
+        self.add_vars(*m.variables)
+
+    @property
+    def map(self) -> pl.DataFrame:
+        if self._pending:
+            self._map = pl.concat([self._map, *self._pending])
+            self._pending = []
+        return self._map
 
     def add_var(self, var: "Variable") -> None:
-        assert var.name is not None, "Variable must have a name to be used in a NamedVariables mapping."
-        self.map = pl.concat(
-            [
-                self.map,
+        self.add_vars(var)
+
+    def add_vars(self, *vars: "Variable") -> None:
+        """
+        Adds the names of the variables to the mapping.
+
+        The names are only concatenated into the mapping once it is next needed such that
+        adding many variables (e.g. one at a time while building a model) requires a single concatenation.
+        """
+        for var in vars:
+            assert var.name is not None, "Variable must have a name to be used in a NamedVariables mapping."
+            self._pending.append(
                 concat_dimensions(var.data, keep_dims=False, prefix=var.name).rename(
                     {"concated_dim": self.VAR_NAME_KEY}
-                ),
-            ]
-        )
+                )
+            )
 
     def map_vars(self, df: pl.DataFrame) -> pl.DataFrame:
         return (
@@ -58,3 +73,10 @@ class NumberedVariables(VariableMapping):
 
 
 DEFAULT_MAP = NumberedVariables()
+
+
+def get_var_map(m: "Model", use_var_names: bool) -> VariableMapping:
+    """
+    Returns the mapping used to name variables when exporting the model (e.g. to an lp file).
+    """
+    return m.var_map if use_var_names else DEFAULT_MAP
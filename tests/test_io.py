@@ -1,9 +1,14 @@
+import copy
+import pickle
+
 import pytest
 import polars as pl
 from polars.testing import assert_frame_equal
 
+from pyoframe import Model
 from pyoframe.variables import Variable
 from pyoframe.constraints import Expression
+from pyoframe.var_mapping import NumberedVariables
 
 
 @pytest.fixture
@@ -57,5 +62,67 @@ def test_expression_with_const_to_str():
     assert str(expr) == "2 x1 +5"
 
 
+def test_constraint_keeps_expression_str_table():
+    m = Model()
+    m.x = Variable({"t": [1, 2]})
+    m.con = 2 * m.x <= 3
+
+    # The inherited expression table (no sense or rhs) still accepts all of Expression's arguments
+    expr_table = m.con.to_str_table(include_name=False, include_const_term=False)
+    assert expr_table["expr"].to_list() == ["[1]: 2 x[1]", "[2]: 2 x[2]"]
+    assert m.con.to_lp_lines()["expr"].to_list() == [
+        "con[1]: 2 x[1] <= 3",
+        "con[2]: 2 x[2] <= 3",
+    ]
+
+
+def test_failed_to_file_keeps_previous_file(tmp_path):
+    fn = tmp_path / "model.lp"
+    fn.write_text("previous")
+
+    m = Model()
+    m.x = Variable()
+    with pytest.raises(AssertionError, match="No objective set."):
+        m.to_file(fn)
+
+    assert fn.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [fn]
+
+
+def test_copied_model_writes_same_file(tmp_path):
+    m = Model()
+    m.x = Variable({"t": range(3)}, lb=0)
+    m.y = Variable(vtype="binary")
+    m.con = m.x <= 2 * m.y.add_dim("t")
+    m.maximize = m.y
+
+    expected = m.to_file(tmp_path / "original.lp", use_var_names=True).read_text()
+    for i, copied in enumerate([copy.deepcopy(m), pickle.loads(pickle.dumps(m))]):
+        fn = copied.to_file(tmp_path / f"copy{i}.lp", use_var_names=True)
+        assert fn.read_text() == expected
+
+
+def test_to_file_maps_integer_variables_once(tmp_path, monkeypatch):
+    m = Model()
+    m.x = Variable({"t": range(3)}, lb=0)
+    m.y = Variable({"t": range(3)}, vtype="binary")
+    m.z = Variable(vtype="integer", ub=5)
+    m.con = m.x <= 4 * m.y + m.z.add_dim("t")
+    m.maximize = m.z
+
+    mapped = []
+    map_vars = NumberedVariables.map_vars
+
+    def counting_map_vars(self, df):
+        mapped.append(id(df))
+        return map_vars(self, df)
+
+    monkeypatch.setattr(NumberedVariables, "map_vars", counting_map_vars)
+    m.to_file(tmp_path / "model.lp")
+
+    for variable in (m.x, m.y, m.z):
+        assert mapped.count(id(variable.data)) == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
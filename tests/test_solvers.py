@@ -0,0 +1,31 @@
+import pytest
+
+from pyoframe import Model, Variable, sum
+
+
+@pytest.mark.parametrize("use_var_names", [True, False])
+def test_direct_gurobi_model_matches_lp_file(tmp_path, use_var_names):
+    m = Model("direct")
+    m.x = Variable({"t": range(3)}, lb=0, ub=4)
+    m.y = Variable({"t": range(3)}, vtype="binary")
+    m.z = Variable(vtype="integer", lb=-2)
+    m.con_link = m.x <= 3 * m.y
+    m.con_total = sum(m.x) + m.z <= 7.5
+    m.con_z = m.z >= -1
+    m.maximize = sum(2 * m.x - m.y) + m.z
+
+    direct = m.solve(
+        "gurobi", tmp_path / "direct", use_var_names=use_var_names, direct=True
+    )
+    from_file = m.solve("gurobi", tmp_path / "lp", use_var_names=use_var_names)
+
+    assert not (tmp_path / "direct" / "direct.lp").exists()
+    assert (tmp_path / "direct" / "direct.sol").exists()
+
+    assert direct.ObjVal == pytest.approx(from_file.ObjVal)
+    assert sorted((v.VarName, v.X) for v in direct.getVars()) == pytest.approx(
+        sorted((v.VarName, v.X) for v in from_file.getVars())
+    )
+    assert sorted(c.ConstrName for c in direct.getConstrs()) == sorted(
+        c.ConstrName for c in from_file.getConstrs()
+    )